@@ -1,7 +1,16 @@
+import asyncio
+import csv
+import functools
 import os
+import pickle
 import re
+import string
+import sys
+from dataclasses import dataclass, field
 import pandas as pd
 from rapidfuzz import process, fuzz
+from typing import NamedTuple
+
 from dotenv import load_dotenv
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
@@ -20,7 +29,11 @@ from telegram.ext import (
 
 load_dotenv()
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+# opzionale: se impostato, /reload risponde solo in questa chat
+ADMIN_CHAT_ID = os.getenv("ADMIN_CHAT_ID")
 CATALOG_PATH = "catalog.csv"
+# cache pickle del catalogo già parsato/normalizzato (invalidata da mtime+size del CSV)
+CATALOG_CACHE_PATH = "catalog.pkl"
 
 DEFAULT_LANG = "es"
 DEFAULT_VARIANT = "standard"
@@ -34,8 +47,13 @@ VARIANT_HINTS = {
     "standard": {"standard", "std", "normale"},
 }
 
+# pattern di riferimento per i riferimenti unità; detect_unit_ref lo
+# implementa a mano per non pagare il regex su ogni messaggio
 UNIT_REF_REGEX = re.compile(r"(#|unit|unidad|ordine|order|n\.?)\s*(\d{1,5})", re.IGNORECASE)
 
+# punteggio minimo rapidfuzz per accettare un match di modello
+MATCH_THRESHOLD = 70
+
 # callback data prefixes
 CB_UNIT = "UNIT:"
 CB_LANG = "LANG:"
@@ -46,30 +64,78 @@ CB_CANCEL = "CANCEL"
 # NORMALIZE / DETECT
 # ======================
 
+# tabella di traduzione: punteggiatura -> spazio (tranne # e . che servono
+# per unit ref e modelli tipo "P43."). Molto più veloce di due re.sub per query.
+_PUNCT = "".join(c for c in string.punctuation if c not in "#.") + "¡¿«»“”‘’·–—€°"
+_TRANS = str.maketrans({c: " " for c in _PUNCT})
+
+# ogni messaggio chiama normalize 3 volte (detect_lang, detect_variant, match):
+# memoizzare le query brevi evita di rifare lo stesso lavoro
+@functools.lru_cache(maxsize=4096)
 def normalize(text: str) -> str:
-    text = str(text).lower().strip()
-    text = re.sub(r"[^\w\s#\.]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text
+    text = str(text).lower().translate(_TRANS)
+    return " ".join(text.split())
+
+# lookup inverso token -> lingua/variante: una scansione dei token con un
+# .get() per token, invece di un'intersezione di set per ogni lingua
+_TOKEN_TO_LANG = {tok: lang for lang, toks in LANG_HINTS.items() for tok in toks}
+_TOKEN_TO_VARIANT = {tok: var for var, toks in VARIANT_HINTS.items() for tok in toks}
 
 def detect_lang(query: str):
-    tokens = set(normalize(query).split())
-    for lang, hints in LANG_HINTS.items():
-        if tokens.intersection(hints):
+    # a parità di hint vince l'ordine di LANG_HINTS (es prima di en:
+    # "en" è anche una preposizione spagnola)
+    hits = {_TOKEN_TO_LANG[tok] for tok in normalize(query).split() if tok in _TOKEN_TO_LANG}
+    for lang in LANG_HINTS:
+        if lang in hits:
             return lang
     return None
 
 def detect_variant(query: str):
-    tokens = set(normalize(query).split())
-    for var, hints in VARIANT_HINTS.items():
-        if tokens.intersection(hints):
+    hits = {_TOKEN_TO_VARIANT[tok] for tok in normalize(query).split() if tok in _TOKEN_TO_VARIANT}
+    for var in VARIANT_HINTS:
+        if var in hits:
             return var
     return None
 
+def _digits_after(s: str, j: int):
+    # equivalente di \s*(\d{1,5}) a partire da j
+    n = len(s)
+    while j < n and s[j].isspace():
+        j += 1
+    k = j
+    while k < n and s[k].isdecimal() and k - j < 5:
+        k += 1
+    return s[j:k] if k > j else None
+
 def detect_unit_ref(query: str):
-    m = UNIT_REF_REGEX.search(query)
-    if m:
-        return m.group(2)
+    # scanner a mano equivalente a UNIT_REF_REGEX: trigger ('#', 'unit',
+    # 'unidad', 'ordine', 'order', 'n.') seguito da cifre, prima occorrenza.
+    # Poche operazioni C su str invece del regex IGNORECASE con alternazione.
+    s = query.lower()
+    n = len(s)
+    i = 0
+    while i < n:
+        c = s[i]
+        if c == "#":
+            ref = _digits_after(s, i + 1)
+            if ref:
+                return ref
+        elif c == "u" and (s.startswith("unit", i) or s.startswith("unidad", i)):
+            ref = _digits_after(s, i + (6 if s.startswith("unidad", i) else 4))
+            if ref:
+                return ref
+        elif c == "o" and (s.startswith("ordine", i) or s.startswith("order", i)):
+            ref = _digits_after(s, i + (6 if s.startswith("ordine", i) else 5))
+            if ref:
+                return ref
+        elif c == "n":
+            j = i + 1
+            if j < n and s[j] == ".":
+                j += 1
+            ref = _digits_after(s, j)
+            if ref:
+                return ref
+        i += 1
     return None
 
 # ======================
@@ -77,18 +143,48 @@ def detect_unit_ref(query: str):
 # ======================
 
 def read_catalog_csv(path: str) -> pd.DataFrame:
+    # sniffo il separatore sui primi 4KB invece di parsare due volte in try/except
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        sample = f.read(4096)
     try:
-        df = pd.read_csv(path)
-        if df.shape[1] == 1:
-            df = pd.read_csv(path, sep=";")
-        return df
-    except Exception:
-        return pd.read_csv(path, sep=";")
-
-def load_catalog():
-    if not TOKEN:
-        raise ValueError("TELEGRAM_BOT_TOKEN non trovato. Controlla .env nella stessa cartella di bot.py")
+        sep = csv.Sniffer().sniff(sample, delimiters=",;").delimiter
+    except csv.Error:
+        sep = ";"
+    return pd.read_csv(path, sep=sep, dtype=str)
+
+# precompute per rapidfuzz (riempiti da load_catalog): chiavi normalizzate
+# deduplicate + mappa chiave -> righe che la condividono
+CHOICES = []
+CHOICE_TO_ITEM = []
+CHOICE_TO_ITEMS = {}
+
+# indici statici (brand, model) -> righe / unità ordinate (riempiti da load_catalog)
+BY_MODEL = {}
+UNITS_BY_MODEL = {}
+
+# indice invertito (brand, model, unit_ref|None, lang|None, variant|None) -> docs:
+# None fa da jolly, così filter_doc diventa una singola lookup
+DOC_INDEX = {}
+
+class CatalogItem(NamedTuple):
+    # record compatto per riga di catalogo: niente dict da ~300 byte a riga,
+    # accesso per attributo a livello C
+    brand: str
+    model: str
+    unit_ref: str
+    variant: str
+    lang: str
+    availability: str
+    delivery: str
+    url: str
+    keys_norm: tuple
+
+def _unit_rank(u: CatalogItem):
+    # ordina unità con criterio: in_stock prima, poi delivery, poi numero
+    av_rank = 0 if u.availability == "in_stock" else 1
+    return (av_rank, u.delivery, u.unit_ref)
 
+def _read_catalog_rows():
     df = read_catalog_csv(CATALOG_PATH)
     df.columns = [str(c).strip() for c in df.columns]
     print("✅ Colonne lette dal CSV:", df.columns.tolist())
@@ -99,33 +195,107 @@ def load_catalog():
         raise ValueError(f"❌ Mancano colonne nel CSV: {missing}")
 
     catalog = []
-    for _, r in df.iterrows():
-        raw_aliases = str(r.get("Aliases", ""))
-        aliases = [a.strip() for a in raw_aliases.split("|") if a.strip()]
+    # dtype=str + fillna("") garantiscono celle sempre stringa: niente
+    # str(...) difensivo per ogni campo di ogni riga
+    # to_dict("records") evita di costruire una Series per riga come iterrows
+    for r in df[required].fillna("").to_dict("records"):
+        aliases = [a.strip() for a in r["Aliases"].split("|") if a.strip()]
 
         keys = set()
-        keys.add(str(r["Model"]))
+        keys.add(r["Model"])
         keys.add(f"{r['Brand']} {r['Model']}")
         for a in aliases:
             keys.add(a)
 
         keys_norm = [normalize(k) for k in keys]
 
-        catalog.append({
-            "brand": str(r["Brand"]).strip(),
-            "model": str(r["Model"]).strip(),
-            "unit_ref": str(r["Unit_ref"]).strip(),
-            "variant": str(r["Variant"]).lower().strip(),
-            "lang": str(r["Language"]).lower().strip(),
-            "availability": str(r["Availability"]).lower().strip(),
-            "delivery": str(r["Delivery"]).strip(),
-            "url": str(r["URL"]).strip(),
-            "keys_norm": keys_norm,
-        })
+        # intern: brand/model/variant/... si ripetono su molte righe, così
+        # condividono un solo oggetto e i confronti == nei filtri sono puntatori
+        catalog.append(CatalogItem(
+            brand=sys.intern(r["Brand"].strip()),
+            model=sys.intern(r["Model"].strip()),
+            unit_ref=sys.intern(r["Unit_ref"].strip()),
+            variant=sys.intern(r["Variant"].lower().strip()),
+            lang=sys.intern(r["Language"].lower().strip()),
+            availability=sys.intern(r["Availability"].lower().strip()),
+            delivery=r["Delivery"].strip(),
+            url=r["URL"].strip(),
+            keys_norm=tuple(keys_norm),
+        ))
 
     return catalog
 
-CATALOG = load_catalog()
+def load_catalog():
+    if not TOKEN:
+        raise ValueError("TELEGRAM_BOT_TOKEN non trovato. Controlla .env nella stessa cartella di bot.py")
+
+    # se il CSV non è cambiato riuso il pickle: niente parse pandas né
+    # normalize degli alias ad ogni riavvio del bot
+    st = os.stat(CATALOG_PATH)
+    stamp = (st.st_mtime_ns, st.st_size)
+    catalog = None
+    try:
+        with open(CATALOG_CACHE_PATH, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("stamp") == stamp:
+            catalog = payload["catalog"]
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+        catalog = None
+
+    if catalog is None:
+        catalog = _read_catalog_rows()
+        try:
+            with open(CATALOG_CACHE_PATH, "wb") as f:
+                pickle.dump({"stamp": stamp, "catalog": catalog}, f, pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # cache best-effort: senza, si riparsa il CSV al prossimo avvio
+
+    # il catalogo è statico: appiattisco le chiavi una volta sola qui,
+    # invece di ricostruire choices/mapping ad ogni messaggio. Righe diverse
+    # (lingua/variante/unità) condividono le stesse chiavi: deduplico per non
+    # far rifare a WRatio lo stesso confronto N volte
+    CHOICE_TO_ITEMS.clear()
+    for item in catalog:
+        for k in item.keys_norm:
+            CHOICE_TO_ITEMS.setdefault(k, []).append(item)
+    CHOICES[:] = CHOICE_TO_ITEMS.keys()
+    CHOICE_TO_ITEM[:] = [items[0] for items in CHOICE_TO_ITEMS.values()]
+
+    # indicizzo per (brand, model) e pre-ordino le unità una volta sola
+    BY_MODEL.clear()
+    UNITS_BY_MODEL.clear()
+    for item in catalog:
+        BY_MODEL.setdefault((item.brand, item.model), []).append(item)
+    for key, items in BY_MODEL.items():
+        units = {}
+        for x in items:
+            units.setdefault(x.unit_ref, x)
+        UNITS_BY_MODEL[key] = sorted(units.values(), key=_unit_rank)
+
+    DOC_INDEX.clear()
+    for item in catalog:
+        for ur in (item.unit_ref, None):
+            for lg in (item.lang, None):
+                for vr in (item.variant, None):
+                    DOC_INDEX.setdefault((item.brand, item.model, ur, lg, vr), []).append(item)
+
+    return catalog
+
+# riempito da _warmup in post_init: caricare qui a import-time bloccherebbe
+# l'avvio del bot sul parse del CSV
+CATALOG = []
+
+async def _warmup(app: Application):
+    global CATALOG
+    CATALOG = await asyncio.to_thread(load_catalog)
+
+async def reload_catalog(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    # ricarica il CSV senza riavviare il processo (opzionalmente solo per l'admin)
+    if ADMIN_CHAT_ID and str(update.effective_chat.id) != ADMIN_CHAT_ID:
+        return
+    global CATALOG
+    CATALOG = await asyncio.to_thread(load_catalog)
+    await update.message.reply_text(f"🔄 Catalogo ricaricato: {len(CATALOG)} schede ✅")
 
 # ======================
 # MATCH MODEL
@@ -133,89 +303,102 @@ CATALOG = load_catalog()
 
 def best_model_match(query: str):
     qn = normalize(query)
-    choices = []
-    mapping = []
-
-    for item in CATALOG:
-        for k in item["keys_norm"]:
-            choices.append(k)
-            mapping.append(item)
-
-    hit = process.extractOne(qn, choices, scorer=fuzz.WRatio)
+    # fast path: molte query sono già un alias/modello esatto ("pardo p43"),
+    # una lookup evita di far girare WRatio su tutte le chiavi
+    exact = CHOICE_TO_ITEMS.get(qn)
+    if exact:
+        return exact[0], 100
+    # score_cutoff lascia a rapidfuzz il pruning dei candidati sotto soglia
+    # con un upper bound economico, prima del WRatio completo.
+    # processor=None: query e chiavi sono già passate da normalize(), niente
+    # lower/strip ripetuto nel loop interno di rapidfuzz
+    hit = process.extractOne(qn, CHOICES, scorer=fuzz.WRatio, processor=None,
+                             score_cutoff=MATCH_THRESHOLD)
     if not hit:
         return None, 0
-    return mapping[hit[2]], hit[1]
+    return CHOICE_TO_ITEM[hit[2]], hit[1]
 
 def candidates_for_query(query: str):
     want_unit = detect_unit_ref(query)
     base_item, score = best_model_match(query)
-    if not base_item or score < 70:
+    if not base_item or score < MATCH_THRESHOLD:
         return [], score
 
-    cands = [x for x in CATALOG if x["brand"] == base_item["brand"] and x["model"] == base_item["model"]]
+    cands = BY_MODEL.get((base_item.brand, base_item.model), [])
 
     if want_unit:
-        filtered = [x for x in cands if x["unit_ref"] == want_unit]
+        # DOC_INDEX con lang/variant jolly è già la lista per questa unità
+        filtered = DOC_INDEX.get((base_item.brand, base_item.model, want_unit, None, None), [])
         if filtered:
             cands = filtered
 
     return cands, score
 
 def unique_units(cands):
-    # ordina unità con criterio: in_stock prima, poi delivery, poi numero
-    def unit_rank(u):
-        # u: sample row
-        av = u["availability"]
-        av_rank = 0 if av == "in_stock" else 1
-        return (av_rank, u.get("delivery", ""), u.get("unit_ref", ""))
-    units = {}
-    for x in cands:
-        units.setdefault(x["unit_ref"], x)
-    return [units[k] for k in sorted(units.keys(), key=lambda ur: unit_rank(units[ur]))]
+    if not cands:
+        return []
+    key = (cands[0].brand, cands[0].model)
+    units = UNITS_BY_MODEL.get(key, [])
+    if len(cands) != len(BY_MODEL.get(key, ())):
+        # cands già filtrati (es. per unità): restringo la lista pre-ordinata
+        refs = {x.unit_ref for x in cands}
+        return [u for u in units if u.unit_ref in refs]
+    return units
 
 def filter_doc(cands, unit_ref=None, lang=None, variant=None):
+    if not cands:
+        return []
+    key = (cands[0].brand, cands[0].model)
+    if len(cands) == len(BY_MODEL.get(key, ())):
+        return DOC_INDEX.get(key + (unit_ref or None, lang or None, variant or None), [])
+    # cands già ristretti (es. per unità): filtro solo il sottoinsieme
     out = cands
     if unit_ref:
-        out = [x for x in out if x["unit_ref"] == unit_ref]
+        out = [x for x in out if x.unit_ref == unit_ref]
     if lang:
-        out = [x for x in out if x["lang"] == lang]
+        out = [x for x in out if x.lang == lang]
     if variant:
-        out = [x for x in out if x["variant"] == variant]
+        out = [x for x in out if x.variant == variant]
     return out
 
 # ======================
 # INTERACTIVE FLOW
 # ======================
 
+@dataclass(slots=True)
+class Flow:
+    # stato della conversazione: gli slot evitano un dict per utente e
+    # l'hash della chiave ad ogni accesso nei vari step
+    query: str = None
+    cands: list = field(default_factory=list)
+    unit_ref: str = None
+    lang: str = None
+    variant: str = None
+    stage: str = None  # "unit" | "lang" | "variant"
+
 def reset_flow(context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("flow", None)
 
 def ensure_flow(context: ContextTypes.DEFAULT_TYPE):
     if "flow" not in context.user_data:
-        context.user_data["flow"] = {
-            "query": None,
-            "cands": [],
-            "unit_ref": None,
-            "lang": None,
-            "variant": None,
-            "stage": None,  # "unit" | "lang" | "variant"
-        }
+        context.user_data["flow"] = Flow()
     return context.user_data["flow"]
 
 async def ask_unit(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
-    units = unique_units(flow["cands"])
+    units = unique_units(flow.cands)
     if len(units) <= 1:
         # nessuna scelta necessaria
-        flow["unit_ref"] = units[0]["unit_ref"] if units else None
+        flow.unit_ref = units[0].unit_ref if units else None
         return False
 
-    buttons = []
-    for u in units[:10]:
-        title = f"#{u['unit_ref']} · {u['availability']} · {u.get('delivery','')}".strip()
-        buttons.append([InlineKeyboardButton(title, callback_data=f"{CB_UNIT}{u['unit_ref']}")])
-
-    buttons.append([InlineKeyboardButton("❌ Annulla", callback_data=CB_CANCEL)])
-    flow["stage"] = "unit"
+    buttons = [
+        [InlineKeyboardButton(
+            f"#{u.unit_ref} · {u.availability} · {u.delivery}".strip(),
+            callback_data=f"{CB_UNIT}{u.unit_ref}",
+        )]
+        for u in units[:10]
+    ] + [[InlineKeyboardButton("❌ Annulla", callback_data=CB_CANCEL)]]
+    flow.stage = "unit"
 
     await update.message.reply_text(
         "Ho trovato più unità per questo modello. Quale vuoi?",
@@ -225,7 +408,7 @@ async def ask_unit(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
 
 async def ask_lang(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
     # se già impostata, skip
-    if flow["lang"]:
+    if flow.lang:
         return False
 
     buttons = [
@@ -233,7 +416,7 @@ async def ask_lang(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
          InlineKeyboardButton("🇬🇧 Inglese (EN)", callback_data=f"{CB_LANG}en")],
         [InlineKeyboardButton("❌ Annulla", callback_data=CB_CANCEL)],
     ]
-    flow["stage"] = "lang"
+    flow.stage = "lang"
     await update.effective_message.reply_text(
         "In che lingua vuoi la scheda?",
         reply_markup=InlineKeyboardMarkup(buttons),
@@ -241,7 +424,7 @@ async def ask_lang(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
     return True
 
 async def ask_variant(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
-    if flow["variant"]:
+    if flow.variant:
         return False
 
     buttons = [
@@ -249,7 +432,7 @@ async def ask_variant(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
          InlineKeyboardButton("Broker Friendly", callback_data=f"{CB_VAR}broker")],
         [InlineKeyboardButton("❌ Annulla", callback_data=CB_CANCEL)],
     ]
-    flow["stage"] = "variant"
+    flow.stage = "variant"
     await update.effective_message.reply_text(
         "Che versione vuoi?",
         reply_markup=InlineKeyboardMarkup(buttons),
@@ -258,16 +441,16 @@ async def ask_variant(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
 
 async def finalize_and_send(update: Update, context: ContextTypes.DEFAULT_TYPE, flow):
     # prova a trovare 1 documento
-    docs = filter_doc(flow["cands"], flow["unit_ref"], flow["lang"], flow["variant"])
+    docs = filter_doc(flow.cands, flow.unit_ref, flow.lang, flow.variant)
 
     # fallback intelligenti
-    if not docs and flow["lang"] and flow["variant"]:
+    if not docs and flow.lang and flow.variant:
         # prova stessa unità e lingua, ma qualsiasi variant
-        docs = filter_doc(flow["cands"], flow["unit_ref"], flow["lang"], None)
-    if not docs and flow["lang"]:
-        docs = filter_doc(flow["cands"], flow["unit_ref"], flow["lang"], None)
+        docs = filter_doc(flow.cands, flow.unit_ref, flow.lang, None)
+    if not docs and flow.lang:
+        docs = filter_doc(flow.cands, flow.unit_ref, flow.lang, None)
     if not docs:
-        docs = filter_doc(flow["cands"], flow["unit_ref"], None, None)
+        docs = filter_doc(flow.cands, flow.unit_ref, None, None)
 
     if not docs:
         await update.effective_message.reply_text("❌ Non ho trovato un documento compatibile con la scelta.")
@@ -276,24 +459,24 @@ async def finalize_and_send(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
     item = docs[0]
     msg = (
-        f"📄 {item['brand']} {item['model']}  #{item['unit_ref']}\n"
-        f"🌐 {item['lang'].upper()} | 🧾 {item['variant']}\n"
-        f"📦 {item['availability']} | 🚚 {item.get('delivery','')}\n"
-        f"🔗 {item['url']}"
+        f"📄 {item.brand} {item.model}  #{item.unit_ref}\n"
+        f"🌐 {item.lang.upper()} | 🧾 {item.variant}\n"
+        f"📦 {item.availability} | 🚚 {item.delivery}\n"
+        f"🔗 {item.url}"
     )
     await update.effective_message.reply_text(msg)
     reset_flow(context)
 
 async def run_flow(update: Update, context: ContextTypes.DEFAULT_TYPE, query: str):
     flow = ensure_flow(context)
-    flow["query"] = query
+    flow.query = query
 
     # pre-imposta preferenze se l’utente le ha scritte
-    flow["lang"] = detect_lang(query) or flow["lang"]
-    flow["variant"] = detect_variant(query) or flow["variant"]
+    flow.lang = detect_lang(query) or flow.lang
+    flow.variant = detect_variant(query) or flow.variant
     unit = detect_unit_ref(query)
     if unit:
-        flow["unit_ref"] = unit
+        flow.unit_ref = unit
 
     cands, score = candidates_for_query(query)
     if not cands:
@@ -301,10 +484,10 @@ async def run_flow(update: Update, context: ContextTypes.DEFAULT_TYPE, query: st
         reset_flow(context)
         return
 
-    flow["cands"] = cands
+    flow.cands = cands
 
     # 1) chiedi unità se necessario
-    if not flow["unit_ref"]:
+    if not flow.unit_ref:
         asked = await ask_unit(update, context, flow)
         if asked:
             return
@@ -361,7 +544,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # unit selection
     if q.data.startswith(CB_UNIT):
         unit = q.data.split(":", 1)[1]
-        flow["unit_ref"] = unit
+        flow.unit_ref = unit
         await q.edit_message_text(f"Ok, scelgo unità #{unit} ✅")
         # continua con domande successive
         await ask_lang(update, context, flow)
@@ -370,7 +553,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # language selection
     if q.data.startswith(CB_LANG):
         lang = q.data.split(":", 1)[1]
-        flow["lang"] = lang
+        flow.lang = lang
         await q.edit_message_text(f"Ok, lingua {lang.upper()} ✅")
         await ask_variant(update, context, flow)
         return
@@ -378,15 +561,16 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # variant selection
     if q.data.startswith(CB_VAR):
         var = q.data.split(":", 1)[1]
-        flow["variant"] = var
+        flow.variant = var
         await q.edit_message_text(f"Ok, versione {var} ✅")
         await finalize_and_send(update, context, flow)
         return
 
 def main():
-    app = Application.builder().token(TOKEN).build()
+    app = Application.builder().token(TOKEN).post_init(_warmup).build()
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("cancel", cancel))
+    app.add_handler(CommandHandler("reload", reload_catalog))
     app.add_handler(CallbackQueryHandler(handle_callback))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
     app.run_polling()